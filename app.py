@@ -1,5 +1,6 @@
 import os
 import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 
 import streamlit as st
@@ -8,6 +9,7 @@ from config.llm_config import LLMConfig
 from config.settings import PROJECT_ROOT
 from crew import VideoAnalysisSummaryCrew
 from models.base_models import BaseInputModel
+from tools import activity_detection_tool, emotion_detection_tool
 from tools.activity_detection_tool import MediaPipeModel
 from utils import reset_crew_memory
 
@@ -20,6 +22,30 @@ st.set_page_config(
 os.environ["USE_OPENAI"] = 'false'
 os.environ["USE_GROQ"] = 'false'
 
+
+@st.cache_resource(show_spinner=False)
+def start_model_prewarm() -> dict[str, Future]:
+    """
+    Downloads and loads the detection models on a background thread, once per server process, so a slow or
+    unreachable model server never blocks rendering. A failed prewarm is not retried: the models are then
+    loaded on the first analysis instead.
+    """
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-prewarm")
+    prewarms = {
+        "pose detection": executor.submit(activity_detection_tool.prewarm),
+        "emotion detection": executor.submit(emotion_detection_tool.prewarm),
+    }
+    executor.shutdown(wait=False)
+    return prewarms
+
+
+reported_prewarm_failures = st.session_state.setdefault("reported_prewarm_failures", set())
+for model_name, prewarm in start_model_prewarm().items():
+    if model_name not in reported_prewarm_failures and prewarm.done() and prewarm.exception():
+        reported_prewarm_failures.add(model_name)
+        st.warning(f"⚠️ The {model_name} model is not available yet, it will be loaded on first analysis: "
+                   f"{prewarm.exception()}")
+
 st.title("🎥 Video Analysis AI")
 st.markdown("Upload a video to analyze emotions and activities using AI agents")
 
@@ -49,7 +75,7 @@ with col2:
 
     pose_model = st.selectbox(
         "Pose Detection Model",
-        options=[model.name for model in MediaPipeModel if model.name != 'HANDS'],
+        options=[model.name for model in MediaPipeModel],
         index=0,
         help="LITE: Fast but less accurate\nFULL: Balanced\nHEAVY: Most accurate but slower"
     )
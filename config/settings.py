@@ -8,4 +8,7 @@ load_dotenv()
 PROJECT_ROOT = Path(__file__).parent.parent
 
 AGENTS_CONFIG_PATH = str(PROJECT_ROOT / os.getenv("AGENTS_CONFIG_PATH", "config/agents.yml"))
-TASKS_CONFIG_PATH = str(PROJECT_ROOT / os.getenv("TASKS_CONFIG_PATH", "config/tasks.yml"))
\ No newline at end of file
+TASKS_CONFIG_PATH = str(PROJECT_ROOT / os.getenv("TASKS_CONFIG_PATH", "config/tasks.yml"))
+
+MEDIAPIPE_USE_GPU = os.getenv("MEDIAPIPE_USE_GPU", "false").lower() == "true"
+VIDEO_HW_ACCELERATION = os.getenv("VIDEO_HW_ACCELERATION", "false").lower() == "true"
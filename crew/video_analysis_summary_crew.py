@@ -1,3 +1,4 @@
+import logging
 import os
 from datetime import datetime
 from pathlib import Path
@@ -18,6 +19,8 @@ storage_dir = project_root / "crewai_storage"
 
 os.environ["CREWAI_STORAGE_DIR"] = str(storage_dir)
 
+logger = logging.getLogger(__name__)
+
 @CrewBase
 class VideoAnalysisSummaryCrew:
     agents_config = AGENTS_CONFIG_PATH
@@ -150,7 +153,7 @@ class VideoAnalysisSummaryCrew:
     def clean_reasoning_text(self, llm_context: LLMCallHookContext):
         if llm_context:
             clean_llm_response(llm_context)
-            print(f"Clean LLM response: {llm_context.response[:50]}")
+            logger.debug("Clean LLM response: %.50s", llm_context.response)
 
     @before_tool_call
     def validate_tool_input(self, context: ToolCallHookContext):
@@ -1,3 +1,4 @@
+from operator import itemgetter
 from typing import Optional
 
 from pydantic import BaseModel, Field
@@ -5,20 +6,45 @@ from pydantic import BaseModel, Field
 from .base_models import ExecutionError
 
 
+_BODY_LANDMARK_NAMES = (
+    "left_shoulder", "right_shoulder",
+    "left_hip", "right_hip",
+    "left_wrist", "right_wrist",
+    "left_elbow", "right_elbow",
+    "left_ankle", "right_ankle",
+    "left_knee", "right_knee",
+)
+_BODY_LANDMARK_INDICES = (11, 12, 23, 24, 15, 16, 13, 14, 27, 28, 25, 26)
+_pick_body_landmarks = itemgetter(*_BODY_LANDMARK_INDICES)
+
+
+_BODY_MIDPOINT_NAMES = (
+    "avg_shoulder_y",
+    "avg_hip_x", "avg_hip_y", "avg_hip_z",
+    "avg_knee_x", "avg_knee_y",
+    "orientation",
+)
+
+
 class BodyLandmarks:
+    __slots__ = _BODY_LANDMARK_NAMES + _BODY_MIDPOINT_NAMES
+
     def __init__(self, landmarks):
-        self.left_shoulder = landmarks[11]
-        self.right_shoulder = landmarks[12]
-        self.left_hip = landmarks[23]
-        self.right_hip = landmarks[24]
-        self.left_wrist = landmarks[15]
-        self.right_wrist = landmarks[16]
-        self.left_elbow = landmarks[13]
-        self.right_elbow = landmarks[14]
-        self.left_ankle = landmarks[27]
-        self.right_ankle = landmarks[28]
-        self.left_knee = landmarks[25]
-        self.right_knee = landmarks[26]
+        (self.left_shoulder, self.right_shoulder,
+         self.left_hip, self.right_hip,
+         self.left_wrist, self.right_wrist,
+         self.left_elbow, self.right_elbow,
+         self.left_ankle, self.right_ankle,
+         self.left_knee, self.right_knee) = _pick_body_landmarks(landmarks)
+
+        # midpoints shared by several pose predicates, computed once per frame
+        self.avg_shoulder_y = (self.left_shoulder.y + self.right_shoulder.y) / 2
+        self.avg_hip_x = (self.left_hip.x + self.right_hip.x) / 2
+        self.avg_hip_y = (self.left_hip.y + self.right_hip.y) / 2
+        self.avg_hip_z = (self.left_hip.z + self.right_hip.z) / 2
+        self.avg_knee_x = (self.left_knee.x + self.right_knee.x) / 2
+        self.avg_knee_y = (self.left_knee.y + self.right_knee.y) / 2
+        self.orientation = self._get_camera_orientation()
 
     def _get_camera_orientation(self):
         shoulder_width = abs(self.left_shoulder.x - self.right_shoulder.x)
@@ -32,15 +58,13 @@ class BodyLandmarks:
             return "sideways"
 
     def is_walking_pose(self, threshold=0.05):
-        orientation = self._get_camera_orientation()
-
-        if orientation == "frontal":
+        if self.orientation == "frontal":
             return self._detect_walking_frontal(threshold)
         else:
             return self._detect_walking_sideways(threshold)
 
     def _detect_walking_frontal(self, threshold):
-        avg_hip_z = (self.left_hip.z + self.right_hip.z) / 2
+        avg_hip_z = self.avg_hip_z
 
         left_knee_forward = self.left_knee.z < (avg_hip_z - threshold)
         right_knee_forward = self.right_knee.z < (avg_hip_z - threshold)
@@ -50,7 +74,7 @@ class BodyLandmarks:
         return (left_knee_forward and right_knee_behind) or (right_knee_forward and left_knee_behind)
 
     def _detect_walking_sideways(self, threshold=0.08):
-        avg_hip_x = (self.left_hip.x + self.right_hip.x) / 2
+        avg_hip_x = self.avg_hip_x
 
         left_knee_forward = self.left_knee.x < (avg_hip_x - threshold)
         right_knee_forward = self.right_knee.x < (avg_hip_x - threshold)
@@ -63,26 +87,17 @@ class BodyLandmarks:
         return has_stride and ((left_knee_forward and right_knee_behind) or (right_knee_forward and left_knee_behind))
 
     def is_standing_still(self):
-        orientation = self._get_camera_orientation()
-
-        if orientation == "frontal":
-            avg_hip_z = (self.left_hip.z + self.right_hip.z) / 2
-            left_aligned = abs(self.left_knee.z - avg_hip_z) < 0.03
-            right_aligned = abs(self.right_knee.z - avg_hip_z) < 0.03
+        if self.orientation == "frontal":
+            left_aligned = abs(self.left_knee.z - self.avg_hip_z) < 0.03
+            right_aligned = abs(self.right_knee.z - self.avg_hip_z) < 0.03
             return left_aligned and right_aligned
         else:
-            avg_hip_x = (self.left_hip.x + self.right_hip.x) / 2
-            avg_knee_x = (self.left_knee.x + self.right_knee.x) / 2
             knee_separation = abs(self.left_knee.x - self.right_knee.x)
-            return abs(avg_knee_x - avg_hip_x) < 0.05 and knee_separation < 0.08
+            return abs(self.avg_knee_x - self.avg_hip_x) < 0.05 and knee_separation < 0.08
 
     def is_crouching_pose(self, threshold=0.2):
-        avg_hip_y = (self.left_hip.y + self.right_hip.y) / 2
-        avg_knee_y = (self.left_knee.y + self.right_knee.y) / 2
-        avg_shoulder_y = (self.left_shoulder.y + self.right_shoulder.y) / 2
-
-        knees_bent_significantly = (avg_knee_y - avg_hip_y) > threshold
-        torso_lowered = (avg_shoulder_y - avg_hip_y) < 0.3
+        knees_bent_significantly = (self.avg_knee_y - self.avg_hip_y) > threshold
+        torso_lowered = (self.avg_shoulder_y - self.avg_hip_y) < 0.3
 
         return knees_bent_significantly and torso_lowered
 
@@ -101,20 +116,16 @@ class BodyLandmarks:
         return self.get_arm_extension(side) > threshold
 
     def is_hand_raised(self, side='left'):
-        avg_shoulder_y = (self.left_shoulder.y + self.right_shoulder.y) / 2
         wrist = self.left_wrist if side == 'left' else self.right_wrist
-        return wrist.y < avg_shoulder_y
+        return wrist.y < self.avg_shoulder_y
 
     def is_hand_down(self, side='left'):
-        avg_hip_y = (self.left_hip.y + self.right_hip.y) / 2
         wrist = self.left_wrist if side == 'left' else self.right_wrist
-        return wrist.y > avg_hip_y
+        return wrist.y > self.avg_hip_y
 
     def is_hand_at_waist(self, side='left'):
-        avg_shoulder_y = (self.left_shoulder.y + self.right_shoulder.y) / 2
-        avg_hip_y = (self.left_hip.y + self.right_hip.y) / 2
         wrist = self.left_wrist if side == 'left' else self.right_wrist
-        return avg_shoulder_y < wrist.y < avg_hip_y
+        return self.avg_shoulder_y < wrist.y < self.avg_hip_y
 
     def is_hand_forward(self, side='left', threshold=0.1):
         if side == 'left':
@@ -1,11 +1,64 @@
+import io
+import itertools
 import json
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from unittest import TestCase
 from unittest.mock import patch, MagicMock
 
+import cv2
 import numpy as np
-from tensorflow.python.ops.check_ops import assert_equal
-
-from tools.activity_detection_tool import ActivityDetectionTool, MediaPipeModel
+from mediapipe.tasks.python.core.base_options import BaseOptions
+
+from models.activity_detection_models import Activity, BodyLandmarks
+from tools.activity_detection_tool import (
+    ActivityDetectionTool,
+    MediaPipeModel,
+    MODEL_DOWNLOAD_TIMEOUT,
+    prewarm,
+    _init_worker_tool
+)
+
+_ZERO_FRAME = np.zeros((480, 640, 3), dtype=np.uint8)
+_ZERO_FRAME.setflags(write=False)
+
+
+def _create_mock_landmarks(left_wrist_y=0.5, right_wrist_y=0.5,
+                           left_shoulder_y=0.3, right_shoulder_y=0.3,
+                           left_hip_y=0.5, right_hip_y=0.5,
+                           left_knee_y=0.7, right_knee_y=0.7,
+                           left_wrist_x=0.3, right_wrist_x=0.7,
+                           left_elbow_x=0.35, right_elbow_x=0.65,
+                           visibility=1.0):
+    landmarks = []
+    landmark_positions = {
+        11: (left_shoulder_y, 0.3),
+        12: (right_shoulder_y, 0.7),
+        13: (0.4, left_elbow_x),
+        14: (0.4, right_elbow_x),
+        15: (left_wrist_y, left_wrist_x),
+        16: (right_wrist_y, right_wrist_x),
+        23: (left_hip_y, 0.3),
+        24: (right_hip_y, 0.7),
+        25: (left_knee_y, 0.3),
+        26: (right_knee_y, 0.7),
+    }
+
+    for i in range(33):
+        mock_landmark = MagicMock()
+        mock_landmark.z = 0.0
+        mock_landmark.visibility = visibility
+        if i in landmark_positions:
+            mock_landmark.y = landmark_positions[i][0]
+            mock_landmark.x = landmark_positions[i][1]
+        else:
+            mock_landmark.y = 0.5
+            mock_landmark.x = 0.5
+        landmarks.append(mock_landmark)
+
+    return landmarks
 
 
 class TestActivityDetectionTool(TestCase):
@@ -28,7 +81,7 @@ class TestActivityDetectionTool(TestCase):
         result = self.tool._run("invalid_video.mp4", "LITE", 30)
         result_dict = json.loads(result)
 
-        assert_equal(result_dict["error"], "Unable to open video source invalid_video.mp4.")
+        self.assertEqual(result_dict["error"], "Unable to open video source invalid_video.mp4.")
         mock_cap.release.assert_not_called()
         mock_landmarker_instance.close.assert_not_called()
 
@@ -48,7 +101,7 @@ class TestActivityDetectionTool(TestCase):
         result = self.tool._run("test_video.mp4", "LITE", 1)
         result_dict = json.loads(result)
 
-        assert_equal(len(result_dict["statistics"]), 2)
+        self.assertEqual(len(result_dict["statistics"]), 2)
         detection_names = {stat["detection_name"] for stat in result_dict["statistics"]}
         self.assertTrue(any("Pose activity" in name for name in detection_names))
         self.assertTrue(any("Hand activity" in name for name in detection_names))
@@ -72,7 +125,7 @@ class TestActivityDetectionTool(TestCase):
         result = self.tool._run("test_video.mp4", "LITE", 1)
         result_dict = json.loads(result)
 
-        assert_equal(len(result_dict["statistics"]), 0)
+        self.assertEqual(len(result_dict["statistics"]), 0)
         mock_cap.release.assert_called_once()
         mock_landmarker_instance.close.assert_called_once()
 
@@ -92,9 +145,12 @@ class TestActivityDetectionTool(TestCase):
         result = self.tool._run("test_video.mp4", "LITE", 5)
         result_dict = json.loads(result)
 
-        assert_equal(len(result_dict["statistics"]), 2)
+        self.assertEqual(len(result_dict["statistics"]), 2)
         for stat in result_dict["statistics"]:
-            assert_equal(stat["total_fames_appearances"], 2)
+            self.assertEqual(stat["total_fames_appearances"], 2)
+        timestamps = [call.args[1] for call in mock_landmarker_instance.detect_for_video.call_args_list]
+        self.assertEqual(timestamps, [0, 5])
+        mock_cap.get.assert_called_once_with(cv2.CAP_PROP_FPS)
 
     @patch('tools.activity_detection_tool.cv2.VideoCapture')
     @patch('tools.activity_detection_tool.ActivityDetectionTool.download_model')
@@ -111,10 +167,123 @@ class TestActivityDetectionTool(TestCase):
         result = self.tool._run("test_video.mp4", "LITE", 1)
         result_dict = json.loads(result)
 
-        assert_equal(result_dict["error"], "Detection failed")
+        self.assertEqual(result_dict["error"], "Detection failed")
         mock_cap.release.assert_called_once()
         mock_landmarker_instance.close.assert_called_once()
 
+    @patch('tools.activity_detection_tool.cv2.VideoCapture')
+    @patch('tools.activity_detection_tool.ActivityDetectionTool.download_model')
+    @patch('tools.activity_detection_tool.PoseLandmarker.create_from_options')
+    def test_activity_detection_stops_decoder_on_exception(self, mock_pose_landmarker, mock_download,
+                                                           mock_video_capture):
+        mock_download.return_value = "/fake/path/model.task"
+
+        mock_landmarker_instance = MagicMock()
+        mock_landmarker_instance.detect_for_video.side_effect = Exception("Detection failed")
+        mock_pose_landmarker.return_value = mock_landmarker_instance
+
+        mock_cap = self._setup_mock_video_capture(mock_video_capture, total_frames=100)
+
+        result = self.tool._run("test_video.mp4", "LITE", 1)
+        result_dict = json.loads(result)
+
+        self.assertEqual(result_dict["error"], "Detection failed")
+        self.assertLess(mock_cap.read.call_count, 100)
+        mock_cap.release.assert_called_once()
+
+    @patch('tools.activity_detection_tool.cv2.VideoCapture')
+    @patch('tools.activity_detection_tool.ActivityDetectionTool.download_model')
+    @patch('tools.activity_detection_tool.PoseLandmarker.create_from_options')
+    def test_activity_detection_with_decoder_exception(self, mock_pose_landmarker, mock_download,
+                                                       mock_video_capture):
+        mock_download.return_value = "/fake/path/model.task"
+        mock_pose_landmarker.return_value = MagicMock()
+
+        mock_cap = self._setup_mock_video_capture(mock_video_capture, total_frames=1)
+        mock_cap.read.side_effect = Exception("Decode failed")
+
+        result = self.tool._run("test_video.mp4", "LITE", 1)
+        result_dict = json.loads(result)
+
+        self.assertEqual(result_dict["error"], "Decode failed")
+        mock_cap.release.assert_called_once()
+
+    @patch('tools.activity_detection_tool.cv2.VideoCapture')
+    @patch('tools.activity_detection_tool.ActivityDetectionTool.download_model')
+    @patch('tools.activity_detection_tool.PoseLandmarker.create_from_options')
+    def test_activity_detection_downscales_large_frames(self, mock_pose_landmarker, mock_download,
+                                                        mock_video_capture):
+        mock_download.return_value = "/fake/path/model.task"
+
+        mock_landmarker_instance = MagicMock()
+        mock_landmarker_instance.detect_for_video.return_value = self._create_mock_pose_result_with_landmarks()
+        mock_pose_landmarker.return_value = mock_landmarker_instance
+
+        full_hd_frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
+        self._setup_mock_video_capture(mock_video_capture, total_frames=2, frame=full_hd_frame)
+
+        self.tool._run("test_video.mp4", "LITE", 1)
+
+        image_sizes = [(call.args[0].width, call.args[0].height)
+                       for call in mock_landmarker_instance.detect_for_video.call_args_list]
+        self.assertEqual(image_sizes, [(640, 360), (640, 360)])
+
+    @patch('tools.activity_detection_tool.cv2.VideoCapture')
+    @patch('tools.activity_detection_tool.ActivityDetectionTool.download_model')
+    @patch('tools.activity_detection_tool.PoseLandmarker.create_from_options')
+    def test_activity_detection_uses_new_pose_landmarker_per_video(self, mock_pose_landmarker, mock_download,
+                                                                   mock_video_capture):
+        mock_download.return_value = "/fake/path/model.task"
+
+        mock_landmarkers = [MagicMock(), MagicMock()]
+        for mock_landmarker_instance in mock_landmarkers:
+            mock_landmarker_instance.detect_for_video.return_value = self._create_mock_pose_result_with_landmarks()
+        mock_pose_landmarker.side_effect = mock_landmarkers
+
+        for _ in range(2):
+            self._setup_mock_video_capture(mock_video_capture, total_frames=2)
+            self.tool._run("test_video.mp4", "LITE", 1)
+
+        # a VIDEO mode graph tracks across frames, so every video starts on a fresh one from timestamp 0
+        for mock_landmarker_instance in mock_landmarkers:
+            timestamps = [call.args[1] for call in mock_landmarker_instance.detect_for_video.call_args_list]
+            self.assertEqual(timestamps, [0, 1])
+            mock_landmarker_instance.close.assert_called_once()
+
+    @patch('tools.activity_detection_tool.cv2.VideoCapture')
+    @patch('tools.activity_detection_tool.ActivityDetectionTool.download_model')
+    @patch('tools.activity_detection_tool.PoseLandmarker.create_from_options')
+    def test_activity_detection_concurrent_runs_do_not_share_landmarker(self, mock_pose_landmarker, mock_download,
+                                                                        mock_video_capture):
+        mock_download.return_value = "/fake/path/model.task"
+        # both runs have to be inside their detection loop at the same time
+        both_running = threading.Barrier(2, timeout=5)
+        mock_landmarkers = []
+
+        def detect_for_video(image, timestamp):
+            if timestamp == 0:
+                both_running.wait()
+            return self._create_mock_pose_result_with_landmarks()
+
+        def create_landmarker(options):
+            mock_landmarker_instance = MagicMock()
+            mock_landmarker_instance.detect_for_video.side_effect = detect_for_video
+            mock_landmarkers.append(mock_landmarker_instance)
+            return mock_landmarker_instance
+
+        mock_pose_landmarker.side_effect = create_landmarker
+        mock_video_capture.side_effect = lambda *args: self._create_mock_video_capture(total_frames=25)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = list(executor.map(lambda _: json.loads(self.tool._run("v.mp4", "LITE", 1)), range(2)))
+
+        self.assertTrue(all("error" not in result for result in results))
+        self.assertEqual(len(mock_landmarkers), 2)
+        for mock_landmarker_instance in mock_landmarkers:
+            timestamps = [call.args[1] for call in mock_landmarker_instance.detect_for_video.call_args_list]
+            self.assertEqual(timestamps, list(range(25)))
+            mock_landmarker_instance.close.assert_called_once()
+
     @patch('tools.activity_detection_tool.cv2.VideoCapture')
     @patch('tools.activity_detection_tool.ActivityDetectionTool.download_model')
     @patch('tools.activity_detection_tool.PoseLandmarker.create_from_options')
@@ -127,14 +296,160 @@ class TestActivityDetectionTool(TestCase):
         mock_pose_landmarker.return_value = mock_landmarker_instance
 
         for model in ["LITE", "FULL", "HEAVY"]:
-            mock_cap = self._setup_mock_video_capture(mock_video_capture, total_frames=1)
+            self._setup_mock_video_capture(mock_video_capture, total_frames=1)
 
             result = self.tool._run("test_video.mp4", model, 1)
             result_dict = json.loads(result)
 
-            assert_equal(len(result_dict["statistics"]), 2)
+            self.assertEqual(len(result_dict["statistics"]), 2)
             mock_download.assert_called_with(MediaPipeModel[model])
 
+    @patch('tools.activity_detection_tool.cv2.VideoCapture')
+    @patch('tools.activity_detection_tool.ActivityDetectionTool.download_model')
+    @patch('tools.activity_detection_tool.PoseLandmarker.create_from_options')
+    def test_activity_detection_defaults_to_lite_model(self, mock_pose_landmarker, mock_download, mock_video_capture):
+        mock_download.return_value = "/fake/path/model.task"
+        mock_pose_landmarker.return_value = MagicMock()
+        self._setup_mock_video_capture(mock_video_capture, total_frames=0)
+
+        self.tool._run("test_video.mp4", None, 1)
+
+        mock_download.assert_called_once_with(MediaPipeModel.LITE)
+
+    @patch('tools.activity_detection_tool.ProcessPoolExecutor')
+    def test_run_many_keeps_job_order(self, mock_executor_type):
+        jobs = [("video_1.mp4", "LITE", 5), ("video_2.mp4", "FULL", 10)]
+        mock_executor = mock_executor_type.return_value.__enter__.return_value
+        mock_executor.map.side_effect = lambda fn, items: [f"{path}-{model}" for path, model, _ in items]
+
+        results = ActivityDetectionTool.run_many(jobs, max_workers=4)
+
+        self.assertEqual(results, ["video_1.mp4-LITE", "video_2.mp4-FULL"])
+        self.assertEqual(mock_executor_type.call_args.kwargs["max_workers"], 2)
+        self.assertEqual(mock_executor_type.call_args.kwargs["mp_context"].get_start_method(), "spawn")
+
+    @patch('tools.activity_detection_tool.ProcessPoolExecutor')
+    @patch('tools.activity_detection_tool.cv2.VideoCapture')
+    @patch('tools.activity_detection_tool.ActivityDetectionTool.download_model')
+    @patch('tools.activity_detection_tool.PoseLandmarker.create_from_options')
+    def test_run_many_single_job_runs_inline_and_closes_landmarker(self, mock_pose_landmarker, mock_download,
+                                                                    mock_video_capture, mock_executor_type):
+        mock_download.return_value = "/fake/path/model.task"
+        mock_landmarker_instance = MagicMock()
+        mock_landmarker_instance.detect_for_video.return_value = self._create_mock_pose_result_with_landmarks()
+        mock_pose_landmarker.return_value = mock_landmarker_instance
+        self._setup_mock_video_capture(mock_video_capture, total_frames=1)
+
+        results = ActivityDetectionTool.run_many([("video_1.mp4", "LITE", 1)])
+
+        self.assertEqual(len(json.loads(results[0])["statistics"]), 2)
+        mock_executor_type.assert_not_called()
+        mock_landmarker_instance.close.assert_called_once()
+
+    @patch('tools.activity_detection_tool.cv2.setNumThreads')
+    def test_run_many_worker_limits_opencv_threads(self, mock_set_num_threads):
+        _init_worker_tool(ActivityDetectionTool)
+
+        mock_set_num_threads.assert_called_once_with(1)
+
+    @patch('tools.activity_detection_tool.MEDIAPIPE_USE_GPU', True)
+    @patch('tools.activity_detection_tool.ActivityDetectionTool.download_model')
+    @patch('tools.activity_detection_tool.PoseLandmarker.create_from_options')
+    def test_pose_landmarker_falls_back_to_cpu(self, mock_pose_landmarker, mock_download):
+        mock_download.return_value = "/fake/path/model.task"
+        mock_landmarker_instance = MagicMock()
+        mock_pose_landmarker.side_effect = [RuntimeError("GPU delegate unavailable"), mock_landmarker_instance]
+
+        pose_landmarker = self.tool.create_pose_landmarker("LITE")
+
+        self.assertIs(pose_landmarker, mock_landmarker_instance)
+        delegates = [call.args[0].base_options.delegate for call in mock_pose_landmarker.call_args_list]
+        self.assertEqual(delegates, [BaseOptions.Delegate.GPU, BaseOptions.Delegate.CPU])
+
+    @patch('tools.activity_detection_tool.urllib.request.urlopen')
+    def test_download_model_when_not_exists(self, mock_urlopen):
+        mock_urlopen.return_value = self._create_mock_download_response(b"model-bytes")
+
+        with tempfile.TemporaryDirectory() as model_dir, \
+                patch('tools.activity_detection_tool.MEDIA_PIPE_MODEL_DIR', model_dir):
+            result = self.tool.download_model(MediaPipeModel.LITE)
+
+            mock_urlopen.assert_called_once_with(MediaPipeModel.LITE.value[0], timeout=MODEL_DOWNLOAD_TIMEOUT)
+            self.assertTrue(result.endswith('pose_landmarker_lite.task'))
+            with open(result, 'rb') as model_file:
+                self.assertEqual(model_file.read(), b"model-bytes")
+            self.assertFalse([name for name in os.listdir(model_dir) if name.endswith('.part')])
+
+    @patch('tools.activity_detection_tool.urllib.request.urlopen')
+    def test_download_model_when_exists(self, mock_urlopen):
+        with tempfile.TemporaryDirectory() as model_dir, \
+                patch('tools.activity_detection_tool.MEDIA_PIPE_MODEL_DIR', model_dir):
+            open(os.path.join(model_dir, 'pose_landmarker_lite.task'), 'wb').close()
+
+            result = self.tool.download_model(MediaPipeModel.LITE)
+
+            mock_urlopen.assert_not_called()
+            self.assertTrue(result.endswith('pose_landmarker_lite.task'))
+
+    @patch('tools.activity_detection_tool.urllib.request.urlopen')
+    def test_download_model_incomplete_is_discarded(self, mock_urlopen):
+        mock_urlopen.return_value = self._create_mock_download_response(b"trunc", content_length=1024)
+
+        with tempfile.TemporaryDirectory() as model_dir, \
+                patch('tools.activity_detection_tool.MEDIA_PIPE_MODEL_DIR', model_dir):
+            with self.assertRaises(IOError):
+                self.tool.download_model(MediaPipeModel.LITE)
+
+            self.assertEqual([name for name in os.listdir(model_dir) if not name.endswith('.lock')], [])
+
+    @patch('tools.activity_detection_tool.ActivityDetectionTool.download_model')
+    def test_prewarm_downloads_requested_models(self, mock_download):
+        prewarm()
+        mock_download.assert_called_once_with(MediaPipeModel.LITE)
+
+        mock_download.reset_mock()
+        prewarm((MediaPipeModel.LITE, MediaPipeModel.HEAVY))
+        self.assertEqual([call.args[0] for call in mock_download.call_args_list],
+                         [MediaPipeModel.LITE, MediaPipeModel.HEAVY])
+
+    @staticmethod
+    def _create_mock_download_response(data: bytes, content_length: int | None = None):
+        mock_response = MagicMock()
+        mock_response.__enter__.return_value = mock_response
+        mock_response.read.side_effect = io.BytesIO(data).read
+        mock_response.headers = {"Content-Length": str(content_length or len(data))}
+        return mock_response
+
+    def _setup_mock_video_capture(self, mock_video_capture, total_frames, frame=_ZERO_FRAME):
+        mock_cap = self._create_mock_video_capture(total_frames, frame)
+        mock_video_capture.return_value = mock_cap
+        return mock_cap
+
+    @staticmethod
+    def _create_mock_video_capture(total_frames, frame=_ZERO_FRAME):
+        mock_cap = MagicMock()
+        mock_cap.isOpened.return_value = True
+        mock_cap.get.return_value = 1000.0
+
+        frames = itertools.chain(itertools.repeat((True, frame), total_frames),
+                                 itertools.repeat((False, None)))
+        mock_cap.read.side_effect = frames
+        mock_cap.grab.side_effect = lambda: next(frames)[0]
+        return mock_cap
+
+    def _create_mock_pose_result_with_landmarks(self):
+        mock_pose_result = MagicMock()
+        landmarks = _create_mock_landmarks()
+        mock_pose_result.pose_landmarks = [[landmarks[i] for i in range(33)]]
+        return mock_pose_result
+
+
+class TestActivityDetectionHelpers(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tool = ActivityDetectionTool()
+
     def test_detect_activity_from_pose_with_no_landmarks(self):
         result = self.tool.detect_activity_from_pose([])
         self.assertIsNone(result)
@@ -143,106 +458,51 @@ class TestActivityDetectionTool(TestCase):
         result = self.tool.detect_activity_from_pose(None)
         self.assertIsNone(result)
 
+    def test_detect_activity_from_pose_with_occluded_torso(self):
+        result = self.tool.detect_activity_from_pose([_create_mock_landmarks(visibility=0.2)])
+        self.assertIsNone(result)
+
+    def test_detect_activity_from_pose_with_visible_torso(self):
+        result = self.tool.detect_activity_from_pose([_create_mock_landmarks()])
+        self.assertIsNotNone(result)
+        # constructed without validation, so it must still be exactly what validation would have produced
+        self.assertEqual(result, Activity.model_validate(result.model_dump()))
+
+    def test_calculate_average_position(self):
+        landmarks = _create_mock_landmarks(left_shoulder_y=0.2, right_shoulder_y=0.4,
+                                           left_hip_y=0.5, right_hip_y=0.7)
+
+        shoulder_y, hip_y = self.tool.calculate_average_position(BodyLandmarks(landmarks))
+
+        self.assertAlmostEqual(shoulder_y, 0.3)
+        self.assertAlmostEqual(hip_y, 0.6)
+
     def test_detect_hand_position_hands_raised(self):
-        landmarks = self._create_mock_landmarks(
+        landmarks = _create_mock_landmarks(
             left_wrist_y=0.2, right_wrist_y=0.2,
             left_shoulder_y=0.3, right_shoulder_y=0.3
         )
-        from models.activity_detection_models import BodyLandmarks
         body_landmarks = BodyLandmarks(landmarks)
 
         result = self.tool.detect_hand_position(body_landmarks)
-        assert_equal(result, "hands_raised")
+        self.assertEqual(result, "hands_raised")
 
     def test_detect_hand_position_hands_down(self):
-        landmarks = self._create_mock_landmarks(
+        landmarks = _create_mock_landmarks(
             left_wrist_y=0.6, right_wrist_y=0.6,
             left_shoulder_y=0.3, right_shoulder_y=0.3
         )
-        from models.activity_detection_models import BodyLandmarks
         body_landmarks = BodyLandmarks(landmarks)
 
         result = self.tool.detect_hand_position(body_landmarks)
-        assert_equal(result, "hands_down")
+        self.assertEqual(result, "hands_down")
 
     def test_detect_body_movement_standing(self):
-        landmarks = self._create_mock_landmarks(
+        landmarks = _create_mock_landmarks(
             left_knee_y=0.7, right_knee_y=0.7,
             left_hip_y=0.5, right_hip_y=0.5
         )
-        from models.activity_detection_models import BodyLandmarks
         body_landmarks = BodyLandmarks(landmarks)
 
         result = self.tool.detect_body_movement(body_landmarks)
-        assert_equal(result, "standing")
-
-    def _setup_mock_video_capture(self, mock_video_capture, total_frames):
-        mock_cap = MagicMock()
-        mock_cap.isOpened.return_value = True
-        mock_cap.get.side_effect = lambda prop: 1000.0
-
-        mock_frame = np.zeros((480, 640, 3), dtype=np.uint8)
-        read_results = [(True, mock_frame)] * total_frames + [(False, None)]
-        mock_cap.read.side_effect = read_results
-        mock_video_capture.return_value = mock_cap
-        return mock_cap
-
-    def _create_mock_pose_result_with_landmarks(self):
-        mock_pose_result = MagicMock()
-        landmarks = self._create_mock_landmarks()
-        mock_pose_result.pose_landmarks = [[landmarks[i] for i in range(33)]]
-        return mock_pose_result
-
-    def _create_mock_landmarks(self, left_wrist_y=0.5, right_wrist_y=0.5,
-                               left_shoulder_y=0.3, right_shoulder_y=0.3,
-                               left_hip_y=0.5, right_hip_y=0.5,
-                               left_knee_y=0.7, right_knee_y=0.7,
-                               left_wrist_x=0.3, right_wrist_x=0.7,
-                               left_elbow_x=0.35, right_elbow_x=0.65):
-        landmarks = []
-        landmark_positions = {
-            11: (left_shoulder_y, 0.3),
-            12: (right_shoulder_y, 0.7),
-            13: (0.4, left_elbow_x),
-            14: (0.4, right_elbow_x),
-            15: (left_wrist_y, left_wrist_x),
-            16: (right_wrist_y, right_wrist_x),
-            23: (left_hip_y, 0.3),
-            24: (right_hip_y, 0.7),
-            25: (left_knee_y, 0.3),
-            26: (right_knee_y, 0.7),
-        }
-
-        for i in range(33):
-            mock_landmark = MagicMock()
-            if i in landmark_positions:
-                mock_landmark.y = landmark_positions[i][0]
-                mock_landmark.x = landmark_positions[i][1]
-            else:
-                mock_landmark.y = 0.5
-                mock_landmark.x = 0.5
-            landmarks.append(mock_landmark)
-
-        return landmarks
-
-    @patch('os.path.exists')
-    @patch('urllib.request.urlretrieve')
-    @patch('os.makedirs')
-    def test_download_model_when_not_exists(self, mock_makedirs, mock_urlretrieve, mock_exists):
-        mock_exists.return_value = False
-
-        result = self.tool.download_model(MediaPipeModel.LITE)
-
-        mock_makedirs.assert_called_once()
-        mock_urlretrieve.assert_called_once()
-        self.assertTrue(result.endswith('pose_landmarker_lite.task'))
-
-    @patch('os.path.exists')
-    @patch('urllib.request.urlretrieve')
-    def test_download_model_when_exists(self, mock_urlretrieve, mock_exists):
-        mock_exists.return_value = True
-
-        result = self.tool.download_model(MediaPipeModel.LITE)
-
-        mock_urlretrieve.assert_not_called()
-        self.assertTrue(result.endswith('pose_landmarker_lite.task'))
+        self.assertEqual(result, "standing")
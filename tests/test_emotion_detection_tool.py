@@ -1,182 +1,211 @@
+import itertools
 import json
 from unittest import TestCase
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, Mock
 
+import cv2
 import numpy as np
-from tensorflow.python.ops.check_ops import assert_equal
 
-from tools.emotion_detection_tool import EmotionDetectionTool
+from tools.emotion_detection_tool import EmotionDetectionTool, prewarm
+
+_ZERO_FRAME = np.zeros((480, 640, 3), dtype=np.uint8)
+_ZERO_FRAME.setflags(write=False)
+_VIDEO_CAPTURE_SPEC = ['isOpened', 'get', 'grab', 'read', 'release']
+
+EMOTION_DETECTION_CASES = [
+    {
+        "name": "valid_emotions",
+        "frames": 2,
+        "frame_rate": 1,
+        "analyze": [[{"dominant_emotion": "happy", "face_confidence": 0.95}]] * 2,
+        "expected": {"dominant emotion - happy": 2},
+    },
+    {
+        "name": "low_confidence",
+        "frames": 1,
+        "frame_rate": 1,
+        "analyze": [[{"dominant_emotion": "sad", "face_confidence": 0.2}]],
+        "expected": {"anomaly - low confidence": 1},
+    },
+    {
+        "name": "zero_confidence",
+        "frames": 1,
+        "frame_rate": 1,
+        "analyze": [[{"dominant_emotion": "angry", "face_confidence": 0.0}]],
+        "expected": {},
+    },
+    {
+        "name": "frame_sampling",
+        "frames": 10,
+        "frame_rate": 5,
+        "analyze": [[{"dominant_emotion": "neutral", "face_confidence": 0.85}]] * 2,
+        "expected": {"dominant emotion - neutral": 2},
+    },
+    {
+        "name": "multiple_faces",
+        "frames": 1,
+        "frame_rate": 1,
+        "analyze": [[
+            {"dominant_emotion": "happy", "face_confidence": 0.9},
+            {"dominant_emotion": "sad", "face_confidence": 0.8}
+        ]],
+        "expected": {"dominant emotion - happy": 1, "dominant emotion - sad": 1},
+    },
+    {
+        "name": "mixed_confidence_levels",
+        "frames": 3,
+        "frame_rate": 1,
+        "analyze": [
+            [{"dominant_emotion": "happy", "face_confidence": 0.9}],
+            [{"dominant_emotion": "sad", "face_confidence": 0.2}],
+            [{"dominant_emotion": "angry", "face_confidence": 0.5}]
+        ],
+        "expected": {
+            "dominant emotion - happy": 1,
+            "anomaly - low confidence": 1,
+            "dominant emotion - angry": 1,
+        },
+    },
+    {
+        "name": "empty_analysis_result",
+        "frames": 1,
+        "frame_rate": 1,
+        "analyze": [[]],
+        "expected": {},
+    },
+    {
+        "name": "boundary_confidence",
+        "frames": 2,
+        "frame_rate": 1,
+        "analyze": [
+            [{"dominant_emotion": "happy", "face_confidence": 0.3}],
+            [{"dominant_emotion": "sad", "face_confidence": 0.29}]
+        ],
+        "expected": {"dominant emotion - happy": 1, "anomaly - low confidence": 1},
+    },
+]
 
 
 class TestEmotionDetectionTool(TestCase):
 
-    def setUp(self):
-        self.tool = EmotionDetectionTool()
+    @classmethod
+    def setUpClass(cls):
+        cls.tool = EmotionDetectionTool()
+        tqdm_patch = patch('tools.emotion_detection_tool.tqdm', side_effect=lambda iterable, **kwargs: iterable)
+        tqdm_patch.start()
+        cls.addClassCleanup(tqdm_patch.stop)
 
     @patch('tools.emotion_detection_tool.cv2.VideoCapture')
     def test_emotion_detection_video_not_opened(self, mock_video_capture):
-        mock_cap = MagicMock()
+        mock_cap = Mock(spec=_VIDEO_CAPTURE_SPEC)
         mock_cap.isOpened.return_value = False
         mock_video_capture.return_value = mock_cap
 
         result = self.tool._run("invalid_video.mp4", 30)
         result_dict = json.loads(result)
 
-        assert_equal(result_dict["error"], "Unable to open video file")
+        self.assertEqual(result_dict["error"], "Unable to open video file")
         mock_cap.release.assert_not_called()
 
-    @patch('tools.emotion_detection_tool.tqdm')
     @patch('tools.emotion_detection_tool.DeepFace.analyze')
     @patch('tools.emotion_detection_tool.cv2.VideoCapture')
-    def test_emotion_detection_with_valid_emotions(self, mock_video_capture, mock_analyze, mock_tqdm):
-        mock_tqdm.side_effect = lambda iterable, **kwargs: iterable
-        mock_cap = self._setup_mock_video_capture(mock_video_capture, total_frames=2)
-        mock_analyze.return_value = [
-            {"dominant_emotion": "happy", "face_confidence": 0.95}
-        ]
+    def test_emotion_detection_statistics(self, mock_video_capture, mock_analyze):
+        for case in EMOTION_DETECTION_CASES:
+            with self.subTest(case["name"]):
+                mock_analyze.reset_mock()
+                mock_analyze.side_effect = case["analyze"]
+                mock_cap = self._setup_mock_video_capture(mock_video_capture, total_frames=case["frames"])
+
+                result = self.tool._run("test_video.mp4", case["frame_rate"])
+                result_dict = json.loads(result)
+
+                appearances = {stat["detection_name"]: stat["total_fames_appearances"]
+                               for stat in result_dict["statistics"]}
+                self.assertEqual(appearances, case["expected"])
+                # skipped frames are only grabbed; the extra read is the one hitting the end of the video
+                self.assertEqual(mock_cap.read.call_count, len(case["analyze"]) + 1)
+                mock_cap.release.assert_called_once()
 
-        result = self.tool._run("test_video.mp4", 1)
-        result_dict = json.loads(result)
-
-        assert_equal(len(result_dict["statistics"]), 1)
-        assert_equal(result_dict["statistics"][0]["detection_name"], "dominant emotion - happy")
-        assert_equal(result_dict["statistics"][0]["total_fames_appearances"], 2)
-        mock_cap.release.assert_called_once()
-
-    @patch('tools.emotion_detection_tool.tqdm')
     @patch('tools.emotion_detection_tool.DeepFace.analyze')
     @patch('tools.emotion_detection_tool.cv2.VideoCapture')
-    def test_emotion_detection_with_low_confidence(self, mock_video_capture, mock_analyze, mock_tqdm):
-        mock_tqdm.side_effect = lambda iterable, **kwargs: iterable
+    def test_emotion_detection_with_exception(self, mock_video_capture, mock_analyze):
         mock_cap = self._setup_mock_video_capture(mock_video_capture, total_frames=1)
-        mock_analyze.return_value = [
-            {"dominant_emotion": "sad", "face_confidence": 0.2}
-        ]
+        mock_analyze.side_effect = Exception("Analysis failed")
 
         result = self.tool._run("test_video.mp4", 1)
         result_dict = json.loads(result)
 
-        assert_equal(len(result_dict["statistics"]), 1)
-        assert_equal(result_dict["statistics"][0]["detection_name"], "anomaly - low confidence")
+        self.assertEqual(result_dict["error"], "Analysis failed")
+        mock_cap.release.assert_called_once()
 
-    @patch('tools.emotion_detection_tool.tqdm')
     @patch('tools.emotion_detection_tool.DeepFace.analyze')
     @patch('tools.emotion_detection_tool.cv2.VideoCapture')
-    def test_emotion_detection_with_zero_confidence(self, mock_video_capture, mock_analyze, mock_tqdm):
-        mock_tqdm.side_effect = lambda iterable, **kwargs: iterable
+    def test_emotion_detection_with_decoder_exception(self, mock_video_capture, mock_analyze):
         mock_cap = self._setup_mock_video_capture(mock_video_capture, total_frames=1)
-        mock_analyze.return_value = [
-            {"dominant_emotion": "angry", "face_confidence": 0.0}
-        ]
-
-        result = self.tool._run("test_video.mp4", 1)
-        result_dict = json.loads(result)
-
-        assert_equal(len(result_dict["statistics"]), 0)
-
-    @patch('tools.emotion_detection_tool.tqdm')
-    @patch('tools.emotion_detection_tool.DeepFace.analyze')
-    @patch('tools.emotion_detection_tool.cv2.VideoCapture')
-    def test_emotion_detection_with_frame_sampling(self, mock_video_capture, mock_analyze, mock_tqdm):
-        mock_tqdm.side_effect = lambda iterable, **kwargs: iterable
-        mock_cap = self._setup_mock_video_capture(mock_video_capture, total_frames=10)
-        mock_analyze.return_value = [
-            {"dominant_emotion": "neutral", "face_confidence": 0.85}
-        ]
-
-        result = self.tool._run("test_video.mp4", 5)
-        result_dict = json.loads(result)
+        mock_cap.read.side_effect = Exception("Decode failed")
 
-        assert_equal(result_dict["statistics"][0]["total_fames_appearances"], 2)
+        result_dict = json.loads(self.tool._run("test_video.mp4", 1))
 
-    @patch('tools.emotion_detection_tool.tqdm')
-    @patch('tools.emotion_detection_tool.DeepFace.analyze')
-    @patch('tools.emotion_detection_tool.cv2.VideoCapture')
-    def test_emotion_detection_with_multiple_faces(self, mock_video_capture, mock_analyze, mock_tqdm):
-        mock_tqdm.side_effect = lambda iterable, **kwargs: iterable
-        mock_cap = self._setup_mock_video_capture(mock_video_capture, total_frames=1)
-        mock_analyze.return_value = [
-            {"dominant_emotion": "happy", "face_confidence": 0.9},
-            {"dominant_emotion": "sad", "face_confidence": 0.8}
-        ]
-
-        result = self.tool._run("test_video.mp4", 1)
-        result_dict = json.loads(result)
-
-        assert_equal(len(result_dict["statistics"]), 2)
-        emotions = {stat["detection_name"] for stat in result_dict["statistics"]}
-        self.assertIn("dominant emotion - happy", emotions)
-        self.assertIn("dominant emotion - sad", emotions)
+        self.assertEqual(result_dict["error"], "Decode failed")
+        mock_analyze.assert_not_called()
+        mock_cap.release.assert_called_once()
 
-    @patch('tools.emotion_detection_tool.tqdm')
     @patch('tools.emotion_detection_tool.DeepFace.analyze')
     @patch('tools.emotion_detection_tool.cv2.VideoCapture')
-    def test_emotion_detection_with_exception(self, mock_video_capture, mock_analyze, mock_tqdm):
-        mock_tqdm.side_effect = lambda iterable, **kwargs: iterable
-        mock_cap = self._setup_mock_video_capture(mock_video_capture, total_frames=1)
-        mock_analyze.side_effect = Exception("Analysis failed")
+    def test_emotion_detection_progress_counts_sampled_frames(self, mock_video_capture, mock_analyze):
+        mock_analyze.return_value = []
+        self._setup_mock_video_capture(mock_video_capture, total_frames=11)
 
-        result = self.tool._run("test_video.mp4", 1)
-        result_dict = json.loads(result)
+        with patch('tools.emotion_detection_tool.tqdm', side_effect=lambda iterable, **kwargs: iterable) as mock_tqdm:
+            self.tool._run("test_video.mp4", 5)
 
-        assert_equal(len(result_dict["statistics"]), 0)
-        mock_cap.release.assert_called_once()
+        self.assertEqual(mock_tqdm.call_args.kwargs["total"], 3)
+        self.assertEqual(mock_analyze.call_count, 3)
 
-    @patch('tools.emotion_detection_tool.tqdm')
     @patch('tools.emotion_detection_tool.DeepFace.analyze')
     @patch('tools.emotion_detection_tool.cv2.VideoCapture')
-    def test_emotion_detection_mixed_confidence_levels(self, mock_video_capture, mock_analyze, mock_tqdm):
-        mock_tqdm.side_effect = lambda iterable, **kwargs: iterable
-        mock_cap = self._setup_mock_video_capture(mock_video_capture, total_frames=3)
+    def test_emotion_detection_averages_confidence_per_emotion(self, mock_video_capture, mock_analyze):
         mock_analyze.side_effect = [
-            [{"dominant_emotion": "happy", "face_confidence": 0.9}],
-            [{"dominant_emotion": "sad", "face_confidence": 0.2}],
-            [{"dominant_emotion": "angry", "face_confidence": 0.5}]
+            [{"dominant_emotion": "happy", "face_confidence": 0.9},
+             {"dominant_emotion": "sad", "face_confidence": 0.5}],
+            [{"dominant_emotion": "happy", "face_confidence": 0.7},
+             {"dominant_emotion": "sad", "face_confidence": 0.1}],
         ]
+        self._setup_mock_video_capture(mock_video_capture, total_frames=2)
 
-        result = self.tool._run("test_video.mp4", 1)
-        result_dict = json.loads(result)
+        result_dict = json.loads(self.tool._run("test_video.mp4", 1))
 
-        assert_equal(len(result_dict["statistics"]), 3)
+        confidences = {stat["detection_name"]: stat["confidence_avg"] for stat in result_dict["statistics"]}
+        self.assertAlmostEqual(confidences["dominant emotion - happy"], 0.8)
+        self.assertAlmostEqual(confidences["dominant emotion - sad"], 0.5)
+        self.assertIsNone(confidences["anomaly - low confidence"])
 
-    @patch('tools.emotion_detection_tool.tqdm')
     @patch('tools.emotion_detection_tool.DeepFace.analyze')
     @patch('tools.emotion_detection_tool.cv2.VideoCapture')
-    def test_emotion_detection_empty_analysis_result(self, mock_video_capture, mock_analyze, mock_tqdm):
-        mock_tqdm.side_effect = lambda iterable, **kwargs: iterable
-        mock_cap = self._setup_mock_video_capture(mock_video_capture, total_frames=1)
+    def test_emotion_detection_downscales_large_frames(self, mock_video_capture, mock_analyze):
         mock_analyze.return_value = []
+        mock_cap = self._setup_mock_video_capture(mock_video_capture, total_frames=1)
+        full_hd_frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
+        mock_cap.read.side_effect = itertools.chain([(True, full_hd_frame)], itertools.repeat((False, None)))
 
-        result = self.tool._run("test_video.mp4", 1)
-        result_dict = json.loads(result)
-
-        assert_equal(len(result_dict["statistics"]), 0)
+        self.tool._run("test_video.mp4", 1)
 
-    @patch('tools.emotion_detection_tool.tqdm')
-    @patch('tools.emotion_detection_tool.DeepFace.analyze')
-    @patch('tools.emotion_detection_tool.cv2.VideoCapture')
-    def test_emotion_detection_boundary_confidence(self, mock_video_capture, mock_analyze, mock_tqdm):
-        mock_tqdm.side_effect = lambda iterable, **kwargs: iterable
-        mock_cap = self._setup_mock_video_capture(mock_video_capture, total_frames=2)
-        mock_analyze.side_effect = [
-            [{"dominant_emotion": "happy", "face_confidence": 0.3}],
-            [{"dominant_emotion": "sad", "face_confidence": 0.29}]
-        ]
-
-        result = self.tool._run("test_video.mp4", 1)
-        result_dict = json.loads(result)
+        self.assertEqual(mock_analyze.call_args.args[0].shape, (540, 960, 3))
 
-        assert_equal(len(result_dict["statistics"]), 2)
-        emotions = [stat["detection_name"] for stat in result_dict["statistics"]]
-        self.assertIn("dominant emotion - happy", emotions)
-        self.assertIn("anomaly - low confidence", emotions)
+    @patch('tools.emotion_detection_tool.DeepFace.build_model')
+    def test_prewarm_builds_emotion_model(self, mock_build_model):
+        prewarm()
+        mock_build_model.assert_called_once_with("Emotion", task="facial_attribute")
 
     def _setup_mock_video_capture(self, mock_video_capture, total_frames):
-        mock_cap = MagicMock()
+        mock_cap = Mock(spec=_VIDEO_CAPTURE_SPEC)
         mock_cap.isOpened.return_value = True
-        mock_cap.get.side_effect = lambda prop: total_frames if prop == 7 else 1000.0
+        props = {cv2.CAP_PROP_FRAME_COUNT: total_frames}
+        mock_cap.get.side_effect = lambda prop, _props=props: _props.get(prop, 1000.0)
 
-        mock_frame = np.zeros((480, 640, 3), dtype=np.uint8)
-        mock_cap.read.side_effect = [(True, mock_frame)] * total_frames + [(False, None)]
+        frames = itertools.chain(itertools.repeat((True, _ZERO_FRAME), total_frames),
+                                 itertools.repeat((False, None)))
+        mock_cap.read.side_effect = frames
+        mock_cap.grab.side_effect = lambda: next(frames)[0]
         mock_video_capture.return_value = mock_cap
         return mock_cap
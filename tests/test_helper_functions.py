@@ -3,9 +3,10 @@ from unittest.mock import Mock
 
 from utils.helper_functions import (
     format_frame_timestamp,
-    capture_statistics,
+    aggregate_statistics,
     reset_crew_memory,
-    clean_detection_tools_input
+    clean_detection_tools_input,
+    clean_llm_response
 )
 
 
@@ -40,67 +41,36 @@ class TestFormatFrameTimestamp(TestCase):
         self.assertIn("1 day", result)
 
 
-class TestCaptureStatistics(TestCase):
+class TestAggregateStatistics(TestCase):
 
-    def test_capture_statistics_new_activity(self):
-        stats = {}
-        capture_statistics(stats, "activity_1", 1000.0)
+    def test_aggregate_statistics_empty(self):
+        self.assertEqual(aggregate_statistics([]), [])
 
-        self.assertEqual(len(stats), 1)
-        self.assertIn("activity_1", stats)
-        self.assertEqual(stats["activity_1"].detection_name, "activity_1")
-        self.assertEqual(stats["activity_1"].total_fames_appearances, 1)
-        self.assertEqual(len(stats["activity_1"].timestamps), 1)
+    def test_aggregate_statistics_groups_by_name_in_first_seen_order(self):
+        events = [("activity_2", 0.0), ("activity_1", 0.0), ("activity_2", 1000.0)]
 
-    def test_capture_statistics_existing_activity(self):
-        stats = {}
-        capture_statistics(stats, "activity_1", 1000.0)
-        capture_statistics(stats, "activity_1", 2000.0)
+        stats = aggregate_statistics(events)
 
-        self.assertEqual(len(stats), 1)
-        self.assertEqual(stats["activity_1"].total_fames_appearances, 2)
-        self.assertEqual(len(stats["activity_1"].timestamps), 2)
+        self.assertEqual([stat.detection_name for stat in stats], ["activity_2", "activity_1"])
+        self.assertEqual(stats[0].total_fames_appearances, 2)
+        self.assertEqual(stats[0].timestamps, ["0:00:00", "0:00:01"])
+        self.assertEqual(stats[1].total_fames_appearances, 1)
 
-    def test_capture_statistics_multiple_activities(self):
-        stats = {}
-        capture_statistics(stats, "activity_1", 1000.0)
-        capture_statistics(stats, "activity_2", 2000.0)
-        capture_statistics(stats, "activity_3", 3000.0)
+    def test_aggregate_statistics_renders_names_from_keys(self):
+        events = [(("Pose activity", "standing"), 0.0), (("Hand activity", "hands_down"), 0.0)]
 
-        self.assertEqual(len(stats), 3)
-        self.assertIn("activity_1", stats)
-        self.assertIn("activity_2", stats)
-        self.assertIn("activity_3", stats)
+        stats = aggregate_statistics(events, render_name=" - ".join)
 
-    def test_capture_statistics_timestamp_format(self):
-        stats = {}
-        capture_statistics(stats, "activity_1", 5000.0)
+        self.assertEqual([stat.detection_name for stat in stats],
+                         ["Pose activity - standing", "Hand activity - hands_down"])
 
-        self.assertEqual(stats["activity_1"].timestamps[0], "0:00:05")
+    def test_aggregate_statistics_averages_confidences(self):
+        events = [("emotion_1", 0.0), ("anomaly", 0.0), ("emotion_1", 1000.0)]
 
-    def test_capture_statistics_empty_dict(self):
-        stats = {}
-        capture_statistics(stats, "test", 0.0)
+        stats = aggregate_statistics(events, confidences={"emotion_1": [0.6, 0.8]})
 
-        self.assertEqual(len(stats), 1)
-        self.assertEqual(stats["test"].total_fames_appearances, 1)
-
-    def test_capture_statistics_incremental_count(self):
-        stats = {}
-        for i in range(5):
-            capture_statistics(stats, "activity", float(i * 1000))
-
-        self.assertEqual(stats["activity"].total_fames_appearances, 5)
-        self.assertEqual(len(stats["activity"].timestamps), 5)
-
-    def test_capture_statistics_different_activities_independent(self):
-        stats = {}
-        capture_statistics(stats, "activity_1", 1000.0)
-        capture_statistics(stats, "activity_1", 2000.0)
-        capture_statistics(stats, "activity_2", 3000.0)
-
-        self.assertEqual(stats["activity_1"].total_fames_appearances, 2)
-        self.assertEqual(stats["activity_2"].total_fames_appearances, 1)
+        self.assertAlmostEqual(stats[0].confidence_avg, 0.7)
+        self.assertIsNone(stats[1].confidence_avg)
 
 
 class TestResetCrewMemory(TestCase):
@@ -282,3 +252,25 @@ class TestCleanDetectionToolsInput(TestCase):
             clean_detection_tools_input(mock_context)
 
             self.assertEqual(mock_context.tool_input['video_path'], path)
+
+
+class TestCleanLlmResponse(TestCase):
+
+    def _clean(self, response):
+        mock_context = Mock()
+        mock_context.response = response
+        clean_llm_response(mock_context)
+        return mock_context.response
+
+    def test_clean_llm_response_keeps_headings_after_first_plan_marker(self):
+        self.assertEqual(self._clean("Plan:## Action Plan: x"), "## Action Plan: x")
+
+    def test_clean_llm_response_splits_markers_in_order(self):
+        self.assertEqual(self._clean("Strategic Plan:Reasoning Plan:Plan:Plan:"), "Plan:")
+
+    def test_clean_llm_response_report_with_several_plan_headings(self):
+        response = "Reasoning Plan: outline\nFinal Answer:\n## Action Plan: step 1\n## Review Plan: step 2"
+        self.assertEqual(self._clean(response), "step 1\n## Review Plan: step 2")
+
+    def test_clean_llm_response_without_markers(self):
+        self.assertEqual(self._clean("No reasoning here"), "No reasoning here")
@@ -0,0 +1,118 @@
+import itertools
+import time
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+import cv2
+import numpy as np
+
+from utils.video_frames import VideoFrameIterator, get_scaled_frame_size, open_video_capture
+
+
+def _create_mock_video_capture(frames, fps=1000.0):
+    mock_cap = MagicMock()
+    mock_cap.isOpened.return_value = True
+    mock_cap.get.return_value = fps
+
+    reads = itertools.chain(((True, frame) for frame in frames), itertools.repeat((False, None)))
+    mock_cap.read.side_effect = reads
+    mock_cap.grab.side_effect = lambda: next(reads)[0]
+    return mock_cap
+
+
+class TestOpenVideoCapture(TestCase):
+
+    @patch('utils.video_frames.cv2.VideoCapture')
+    def test_open_video_capture_software_decoding(self, mock_video_capture):
+        open_video_capture("test_video.mp4")
+        mock_video_capture.assert_called_once_with("test_video.mp4")
+
+    @patch('utils.video_frames.VIDEO_HW_ACCELERATION', True)
+    @patch('utils.video_frames.cv2.VideoCapture')
+    def test_open_video_capture_hardware_acceleration(self, mock_video_capture):
+        open_video_capture("test_video.mp4")
+        mock_video_capture.assert_called_once_with(
+            "test_video.mp4", cv2.CAP_ANY, [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY])
+
+
+class TestGetScaledFrameSize(TestCase):
+
+    def test_get_scaled_frame_size_landscape(self):
+        self.assertEqual(get_scaled_frame_size(1080, 1920, 640), (640, 360))
+
+    def test_get_scaled_frame_size_portrait(self):
+        self.assertEqual(get_scaled_frame_size(1920, 1080, 640), (360, 640))
+
+    def test_get_scaled_frame_size_small_frame(self):
+        self.assertIsNone(get_scaled_frame_size(480, 640, 640))
+
+
+class TestVideoFrameIterator(TestCase):
+
+    def test_video_frame_iterator_samples_frames(self):
+        frames = [np.full((4, 4, 3), i, dtype=np.uint8) for i in range(10)]
+        mock_cap = _create_mock_video_capture(frames)
+
+        with VideoFrameIterator(mock_cap, sample_rate=5) as video_frames:
+            sampled = [(timestamp, frame[0, 0, 0]) for timestamp, frame in video_frames]
+
+        self.assertEqual(sampled, [(0.0, 0), (5.0, 5)])
+        self.assertEqual(mock_cap.read.call_count, 3)
+        mock_cap.get.assert_called_once_with(cv2.CAP_PROP_FPS)
+        mock_cap.release.assert_not_called()
+
+    def test_video_frame_iterator_defaults_fps(self):
+        mock_cap = _create_mock_video_capture([np.zeros((4, 4, 3), dtype=np.uint8)] * 2, fps=0.0)
+
+        with VideoFrameIterator(mock_cap) as video_frames:
+            timestamps = [timestamp for timestamp, _ in video_frames]
+
+        self.assertEqual(timestamps, [0.0, 1000.0 / 30.0])
+
+    def test_video_frame_iterator_converts_to_rgb(self):
+        bgr_frame = np.zeros((4, 4, 3), dtype=np.uint8)
+        bgr_frame[..., 0] = 255
+        mock_cap = _create_mock_video_capture([bgr_frame])
+
+        with VideoFrameIterator(mock_cap, rgb=True) as video_frames:
+            rgb_frames = [frame.copy() for _, frame in video_frames]
+
+        self.assertEqual(rgb_frames[0][0, 0].tolist(), [0, 0, 255])
+
+    def test_video_frame_iterator_downscales_large_frames(self):
+        mock_cap = _create_mock_video_capture([np.zeros((1080, 1920, 3), dtype=np.uint8)] * 2)
+
+        with VideoFrameIterator(mock_cap, max_size=640) as video_frames:
+            shapes = [frame.shape for _, frame in video_frames]
+
+        self.assertEqual(shapes, [(360, 640, 3), (360, 640, 3)])
+
+    def test_video_frame_iterator_does_not_overwrite_queued_frames(self):
+        frames = [np.full((4, 4, 3), i, dtype=np.uint8) for i in range(20)]
+        mock_cap = _create_mock_video_capture(frames)
+
+        values = []
+        with VideoFrameIterator(mock_cap, rgb=True) as video_frames:
+            for _, frame in video_frames:
+                # give the decoder time to fill the queue before the held frame is read
+                time.sleep(0.01)
+                values.append(frame[0, 0, 0])
+
+        self.assertEqual(values, list(range(20)))
+
+    def test_video_frame_iterator_reraises_decoder_exception(self):
+        mock_cap = _create_mock_video_capture([])
+        mock_cap.read.side_effect = Exception("Decode failed")
+
+        with self.assertRaisesRegex(Exception, "Decode failed"):
+            with VideoFrameIterator(mock_cap) as video_frames:
+                list(video_frames)
+
+    def test_video_frame_iterator_stops_decoder_when_consumer_stops(self):
+        mock_cap = _create_mock_video_capture([np.zeros((4, 4, 3), dtype=np.uint8)] * 100)
+
+        with VideoFrameIterator(mock_cap) as video_frames:
+            next(iter(video_frames))
+
+        self.assertFalse(video_frames._decoder.is_alive())
+        self.assertLess(mock_cap.read.call_count, 100)
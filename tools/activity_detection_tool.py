@@ -1,6 +1,12 @@
+import multiprocessing
 import os
-import urllib
+import shutil
+import tempfile
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from enum import Enum
+from operator import itemgetter
 
 import cv2
 import mediapipe as mp
@@ -8,27 +14,49 @@ from crewai.tools import BaseTool
 from mediapipe.tasks.python import vision
 from mediapipe.tasks.python.components.containers import NormalizedLandmark
 from mediapipe.tasks.python.core.base_options import BaseOptions
-from mediapipe.tasks.python.vision import HandLandmarkerOptions, HandLandmarker
 from mediapipe.tasks.python.vision.pose_landmarker import (
     PoseLandmarkerOptions,
     PoseLandmarker)
 
+from config.settings import MEDIAPIPE_USE_GPU
 from models import ExecutionError
 from models.activity_detection_models import (
     BodyLandmarks,
     Activity
 )
 from models.base_models import DetectionToolOutput, BaseInputModel
-from utils import capture_statistics
+from utils import aggregate_statistics, VideoFrameIterator, open_video_capture
+
+try:
+    import fcntl
+    msvcrt = None
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
 
 MEDIA_PIPE_MODEL_BASE_URL = "https://storage.googleapis.com/mediapipe-models/"
+MEDIA_PIPE_MODEL_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'media_pipe', 'pose_models')
+MODEL_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# seconds a connection attempt or a single read may block
+MODEL_DOWNLOAD_TIMEOUT = 30
+# longest side frames are downscaled to before pose inference
+POSE_INPUT_MAX_SIZE = 640
 
 
 class MediaPipeModel(Enum):
     LITE = MEDIA_PIPE_MODEL_BASE_URL + "pose_landmarker/pose_landmarker_lite/float16/1/pose_landmarker_lite.task", "pose_landmarker_lite.task"
     FULL = MEDIA_PIPE_MODEL_BASE_URL + "pose_landmarker/pose_landmarker_full/float16/1/pose_landmarker_full.task", "pose_landmarker_full.task"
     HEAVY = MEDIA_PIPE_MODEL_BASE_URL + "pose_landmarker/pose_landmarker_heavy/float16/1/pose_landmarker_heavy.task", "pose_landmarker_heavy.task"
-    HANDS = MEDIA_PIPE_MODEL_BASE_URL + "hand_landmarker/hand_landmarker/float16/1/hand_landmarker.task", "hand_landmarker.task"
+
+
+DEFAULT_POSE_MODEL = MediaPipeModel.LITE
+
+POSE_ACTIVITY_LABEL = "Pose activity"
+HAND_ACTIVITY_LABEL = "Hand activity"
+
+# shoulders and hips
+MIN_LANDMARK_VISIBILITY = 0.5
+_pick_torso_landmarks = itemgetter(11, 12, 23, 24)
 
 
 class ActivityDetectionTool(BaseTool):
@@ -42,12 +70,20 @@ class ActivityDetectionTool(BaseTool):
 
         landmarks = pose_landmarks[0]
 
+        if not self.is_torso_visible(landmarks):
+            return None
+
         body_landmarks = BodyLandmarks(landmarks)
-        return Activity(
+        return Activity.model_construct(
             hands_activity=self.detect_hand_position(body_landmarks),
             movement_activity=self.detect_body_movement(body_landmarks),
         )
 
+    @staticmethod
+    def is_torso_visible(landmarks: list[NormalizedLandmark]) -> bool:
+        return all(landmark.visibility is None or landmark.visibility >= MIN_LANDMARK_VISIBILITY
+                   for landmark in _pick_torso_landmarks(landmarks))
+
     def detect_standing_or_sitting(self, body_landmarks: BodyLandmarks):
         shoulder_y, hip_y = self.calculate_average_position(body_landmarks)
         torso_length = abs(hip_y - shoulder_y)
@@ -72,107 +108,168 @@ class ActivityDetectionTool(BaseTool):
 
     @staticmethod
     def calculate_average_position(body_landmarks: BodyLandmarks):
-        shoulder_y = (body_landmarks.left_shoulder.y + body_landmarks.right_shoulder.y) / 2
-        hip_y = (body_landmarks.left_hip.y + body_landmarks.right_hip.y) / 2
-        return shoulder_y, hip_y
+        return body_landmarks.avg_shoulder_y, body_landmarks.avg_hip_y
 
     @staticmethod
     def download_model(pose_model: MediaPipeModel):
-        pose_model_url = pose_model.value[0]
-        pose_model_name = pose_model.value[1]
-
-        model_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'media_pipe', 'pose_models')
-        os.makedirs(model_dir, exist_ok=True)
-
-        model_path = os.path.join(model_dir, pose_model_name)
+        pose_model_url, pose_model_name = pose_model.value
+        model_path = ActivityDetectionTool.get_model_path(pose_model)
 
         if not os.path.exists(model_path):
-            print(f'Downloading model file... {pose_model_name}')
-            urllib.request.urlretrieve(pose_model_url, model_path)
-            print(f'Model {pose_model_name} downloaded successfully.')
+            os.makedirs(MEDIA_PIPE_MODEL_DIR, exist_ok=True)
+            with _file_lock(model_path + ".lock"):
+                # another process may have downloaded it while this one waited for the lock
+                if not os.path.exists(model_path):
+                    print(f'Downloading model file... {pose_model_name}')
+                    _download_file(pose_model_url, model_path)
+                    print(f'Model {pose_model_name} downloaded successfully.')
 
         return model_path
 
-    def _run(self, video_path, pose_model: str, frame_rate: int = 5) -> str:
-        pose_model = self.download_model(MediaPipeModel[pose_model])
+    def create_pose_landmarker(self, pose_model: str) -> PoseLandmarker:
+        pose_model_path = self.download_model(MediaPipeModel[pose_model])
 
-        pose_options = PoseLandmarkerOptions(
-            base_options=BaseOptions(model_asset_path=pose_model),
-            min_pose_detection_confidence=0.8,
-            min_tracking_confidence=0.8,
-            min_pose_presence_confidence=0.8,
-            running_mode=vision.RunningMode.VIDEO,
-        )
-        pose_landmarker = PoseLandmarker.create_from_options(pose_options)
+        def pose_landmarker_options(delegate: BaseOptions.Delegate) -> PoseLandmarkerOptions:
+            return PoseLandmarkerOptions(
+                base_options=BaseOptions(model_asset_path=pose_model_path, delegate=delegate),
+                min_pose_detection_confidence=0.8,
+                min_tracking_confidence=0.8,
+                min_pose_presence_confidence=0.8,
+                running_mode=vision.RunningMode.VIDEO,
+            )
+
+        if not MEDIAPIPE_USE_GPU:
+            return PoseLandmarker.create_from_options(pose_landmarker_options(BaseOptions.Delegate.CPU))
+        try:
+            return PoseLandmarker.create_from_options(pose_landmarker_options(BaseOptions.Delegate.GPU))
+        except RuntimeError as e:
+            print(f"⚠️  MediaPipe GPU delegate unavailable ({e}). Falling back to CPU.")
+            return PoseLandmarker.create_from_options(pose_landmarker_options(BaseOptions.Delegate.CPU))
+
+    def _run(self, video_path, pose_model: str | None = None, frame_rate: int = 5) -> str:
+        pose_model = pose_model or DEFAULT_POSE_MODEL.name
+        if pose_model == MediaPipeModel.HEAVY.name:
+            print("⚠️  HEAVY pose model requested: it is several times slower than LITE on CPU.")
 
-        cap = cv2.VideoCapture(video_path)
+        cap = open_video_capture(video_path)
 
         if not cap.isOpened():
             return ExecutionError(error=f"Unable to open video source {video_path}.").model_dump_json(indent=2)
 
-        activity_stats = {}
+        activity_events: list[tuple[tuple[str, str], float]] = []
 
-        frame_number = 0
         analyzed_counter = 0
+        pose_landmarker = None
 
         try:
-            while cap.isOpened():
-                ret, frame = cap.read()
+            pose_landmarker = self.create_pose_landmarker(pose_model)
 
-                if not ret:
-                    break
+            with VideoFrameIterator(cap, sample_rate=frame_rate, max_size=POSE_INPUT_MAX_SIZE, rgb=True) as frames:
+                for timestamp, rgb_frame in frames:
+                    analyzed_counter += 1
+                    mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
 
-                """
-                frame sampling mechanism for improved performance. 
-                Useful for activity detection where analyzing every single frame may be unnecessary and processing-intensive.
-                """
-                if frame_number % frame_rate != 0:
-                    frame_number += 1
-                    continue
+                    pose_result = pose_landmarker.detect_for_video(mp_image, int(timestamp))
 
-                analyzed_counter += 1
-                timestamp = cap.get(cv2.CAP_PROP_POS_MSEC)
+                    # analyze activities from pose
+                    detected_activity = self.detect_activity_from_pose(pose_result.pose_landmarks)
 
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
-
-                pose_result = pose_landmarker.detect_for_video(mp_image, int(timestamp))
-
-                # analyze activities from pose
-                detected_activity = self.detect_activity_from_pose(pose_result.pose_landmarks)
-
-                if detected_activity:
-                    capture_statistics(activity_stats, f"Pose activity - {detected_activity.movement_activity}",
-                                       timestamp)
-                    capture_statistics(activity_stats, f"Hand activity - {detected_activity.hands_activity}", timestamp)
-
-                frame_number += 1
+                    if detected_activity:
+                        activity_events.append(((POSE_ACTIVITY_LABEL, detected_activity.movement_activity), timestamp))
+                        activity_events.append(((HAND_ACTIVITY_LABEL, detected_activity.hands_activity), timestamp))
         except Exception as e:
             return ExecutionError(error=str(e)).model_dump_json(indent=2)
         finally:
             cap.release()
-            pose_landmarker.close()
+            if pose_landmarker is not None:
+                pose_landmarker.close()
 
         response = DetectionToolOutput(
-            statistics=list(activity_stats.values()),
+            statistics=aggregate_statistics(activity_events, render_name=" - ".join),
         )
         return response.model_dump_json(indent=2)
 
-    def get_hand_landmarker(self) -> HandLandmarker:
-        hands_model = self.download_model(MediaPipeModel.HANDS)
-        hand_options = HandLandmarkerOptions(
-            base_options=BaseOptions(model_asset_path=hands_model),
-            running_mode=vision.RunningMode.VIDEO,
-            min_hand_detection_confidence=0.8,
-            min_tracking_confidence=0.8,
-            min_hand_presence_confidence=0.8,
-            num_hands=2
-        )
-
-        hands_landmarker = HandLandmarker.create_from_options(hand_options)
-        return hands_landmarker
+    @classmethod
+    def run_many(cls, jobs: list[tuple[str, str | None, int]], max_workers: int | None = None) -> list[str]:
+        """
+        Runs (video_path, pose_model, frame_rate) jobs across a process pool, returning results in job order.
+        """
+        if len(jobs) <= 1:
+            return [cls()._run(*job) for job in jobs]
+
+        max_workers = max_workers or max(1, (os.cpu_count() or 2) // 2)
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(jobs)),
+                                 mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_init_worker_tool,
+                                 initargs=(cls,)) as executor:
+            return list(executor.map(_run_worker_job, jobs))
 
     @staticmethod
     def get_model_path(pose_model: MediaPipeModel):
-        return os.path.join(os.path.dirname(os.path.dirname(__file__)), 'media_pipe', 'pose_models',
-                            pose_model.value[1])
+        return os.path.join(MEDIA_PIPE_MODEL_DIR, pose_model.value[1])
+
+
+def prewarm(models: tuple[MediaPipeModel, ...] = (DEFAULT_POSE_MODEL,)):
+    """
+    Downloads the given pose models ahead of the first analysis.
+    """
+    for model in models:
+        ActivityDetectionTool.download_model(model)
+
+
+@contextmanager
+def _file_lock(lock_path: str):
+    with open(lock_path, "w") as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        else:
+            _msvcrt_lock(lock_file)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _msvcrt_lock(lock_file):
+    lock_file.seek(0)
+    while True:
+        try:
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError:  # LK_LOCK gives up after ten attempts
+            continue
+
+
+def _download_file(url: str, path: str):
+    tmp_file = tempfile.NamedTemporaryFile(dir=os.path.dirname(path), suffix=".part", delete=False)
+    try:
+        with tmp_file, urllib.request.urlopen(url, timeout=MODEL_DOWNLOAD_TIMEOUT) as response:
+            shutil.copyfileobj(response, tmp_file, MODEL_DOWNLOAD_CHUNK_SIZE)
+            tmp_file.flush()
+            os.fsync(tmp_file.fileno())
+
+            expected_size = response.headers.get("Content-Length")
+            if expected_size and tmp_file.tell() != int(expected_size):
+                raise IOError(f"Incomplete download of {url}: got {tmp_file.tell()} of {expected_size} bytes")
+        os.replace(tmp_file.name, path)
+    except BaseException:
+        if os.path.exists(tmp_file.name):
+            os.unlink(tmp_file.name)
+        raise
+
+
+_worker_tool: ActivityDetectionTool | None = None
+
+
+def _init_worker_tool(tool_type: type[ActivityDetectionTool]):
+    global _worker_tool
+    cv2.setNumThreads(1)
+    _worker_tool = tool_type()
+
+
+def _run_worker_job(job: tuple[str, str | None, int]) -> str:
+    return _worker_tool._run(*job)
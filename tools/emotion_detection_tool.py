@@ -1,3 +1,5 @@
+import math
+
 import cv2
 from crewai.tools import BaseTool
 from deepface import DeepFace
@@ -7,8 +9,16 @@ from tqdm import tqdm
 from models import (
     ExecutionError
 )
-from models.base_models import BaseInputModel, DetectionStatistics, DetectionToolOutput
-from utils import capture_statistics
+from models.base_models import BaseInputModel, DetectionToolOutput
+from utils import aggregate_statistics, VideoFrameIterator, open_video_capture
+
+# longest side frames are downscaled to before DeepFace detects faces on them
+EMOTION_INPUT_MAX_SIZE = 960
+
+DOMINANT_EMOTION_LABEL = "dominant emotion"
+ANOMALY_LOW_CONFIDENCE = ("anomaly", "low confidence")
+# faces DeepFace detects with a lower confidence are reported as anomalies instead of emotions
+MIN_FACE_CONFIDENCE = 0.3
 
 
 class EmotionDetectionTool(BaseTool):
@@ -16,51 +26,40 @@ class EmotionDetectionTool(BaseTool):
     description: str = "Analyzes emotions in faces detected in video. Requires video_path (string) parameter. Returns JSON with total_faces_analyzed, emotions_detected array, emotion_summary, and anomalies."
     args_schema: type[BaseModel] = BaseInputModel
 
-    def _run(self, video_path: str, frame_rate:int, pose_model: str) -> str:
-        cap = cv2.VideoCapture(video_path)
+    def _run(self, video_path: str, frame_rate: int, pose_model: str | None = None) -> str:
+        cap = open_video_capture(video_path)
         if not cap.isOpened():
             return ExecutionError(error="Unable to open video file").model_dump_json(indent=2)
 
-        emotions_stats : dict[str, DetectionStatistics] = {}
-        # ##initialize the counter
-        total_frames = cap.get(cv2.CAP_PROP_FRAME_COUNT)
-        frame_number = 0
+        emotion_events: list[tuple[tuple[str, str], float]] = []
+        emotion_confidences: dict[tuple[str, str], list[float]] = {}
         try:
-            for _ in tqdm(range(int(total_frames)), desc="Analyzing emotions"):
-                ret, frame = cap.read()
-
-                if not ret:
-                    break
-
-                """
-                frame sampling mechanism for improved performance. 
-                Useful for activity detection where analyzing every single frame may be unnecessary and processing-intensive.
-                """
-                if frame_number % frame_rate != 0:
-                    frame_number += 1
-                    continue
-
-                analysis_result = DeepFace.analyze(frame, actions=['emotion'], enforce_detection=False)
-                timestamp = cap.get(cv2.CAP_PROP_POS_MSEC)
-                confidences = []
-                for face in analysis_result:
-                    dominant_emotion = f"dominant emotion - {face["dominant_emotion"]}"
-                    face_confidence = face["face_confidence"]
-                    if face_confidence == 0.0:
-                        continue
-                    if dominant_emotion and face_confidence < 0.3:
-                        anomaly_low_confidence = "anomaly - low confidence"
-                        capture_statistics(emotions_stats, anomaly_low_confidence, timestamp)
-                        continue
-
-                    confidences.append(face_confidence)
-                    capture_statistics(emotions_stats, dominant_emotion, timestamp, confidences)
+            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            sampled_frames = math.ceil(total_frames / frame_rate) if total_frames > 0 else None
+            with VideoFrameIterator(cap, sample_rate=frame_rate, max_size=EMOTION_INPUT_MAX_SIZE) as frames:
+                for timestamp, frame in tqdm(frames, total=sampled_frames, desc="Analyzing emotions"):
+                    analysis_result = DeepFace.analyze(frame, actions=['emotion'], enforce_detection=False)
+                    for face in analysis_result:
+                        face_confidence = face["face_confidence"]
+                        if face_confidence == 0.0:
+                            continue
+                        if face_confidence < MIN_FACE_CONFIDENCE:
+                            emotion_events.append((ANOMALY_LOW_CONFIDENCE, timestamp))
+                            continue
 
-                frame_number += 1
+                        dominant_emotion = (DOMINANT_EMOTION_LABEL, face["dominant_emotion"])
+                        emotion_events.append((dominant_emotion, timestamp))
+                        emotion_confidences.setdefault(dominant_emotion, []).append(face_confidence)
         except Exception as e:
-            ExecutionError(error=str(e)).model_dump_json(indent=2)
+            return ExecutionError(error=str(e)).model_dump_json(indent=2)
         finally:
             cap.release()
-        return DetectionToolOutput(statistics= list(emotions_stats.values())).model_dump_json(indent=2)
+        statistics = aggregate_statistics(emotion_events, render_name=" - ".join, confidences=emotion_confidences)
+        return DetectionToolOutput(statistics=statistics).model_dump_json(indent=2)
 
 
+def prewarm():
+    """
+    Builds the DeepFace emotion model ahead of the first analysis.
+    """
+    DeepFace.build_model("Emotion", task="facial_attribute")
@@ -1,13 +1,16 @@
 from .helper_functions import (
-    format_frame_timestamp, capture_statistics, reset_crew_memory,
+    format_frame_timestamp, aggregate_statistics, reset_crew_memory,
     clean_llm_response, clean_detection_tools_input, calculate_average_confidence
 )
+from .video_frames import VideoFrameIterator, open_video_capture
 
 __all__ = [
-    "capture_statistics",
+    "aggregate_statistics",
     "format_frame_timestamp",
     "reset_crew_memory",
     "clean_llm_response",
     "clean_detection_tools_input",
-    "calculate_average_confidence"
+    "calculate_average_confidence",
+    "VideoFrameIterator",
+    "open_video_capture"
 ]
@@ -1,7 +1,9 @@
 import datetime
 import json
+import logging
 import os
-from functools import reduce
+from collections.abc import Callable, Hashable
+from functools import cache, reduce
 
 from crewai import Crew
 from crewai.hooks import LLMCallHookContext, ToolCallHookContext
@@ -9,6 +11,16 @@ from crewai.utilities.paths import db_storage_path
 
 from models.base_models import DetectionStatistics
 
+logger = logging.getLogger(__name__)
+
+_REASONING_MARKERS = (
+    "Reasoning Plan:",
+    "Strategic Plan:",
+    "Analysis Plan:",
+    "Plan:",
+    "Final Answer:",
+)
+
 
 def calculate_average_confidence(confidences: list[float]):
     total = reduce(lambda a, b: a + b, confidences, 0.0)
@@ -20,22 +32,25 @@ def format_frame_timestamp(timestamp: float) -> str:
     return str(datetime.timedelta(milliseconds=timestamp))
 
 
-def capture_statistics(stats: dict[str, DetectionStatistics],
-                       detected_activity: str,
-                       timestamp: float,
-                       confidences: list[float] = None):
-    stats[detected_activity] = stats.get(detected_activity,
-                                         DetectionStatistics(
-                                             detection_name=detected_activity,
-                                             total_fames_appearances=0,
-                                             timestamps=[],
-                                             confidence_avg=calculate_average_confidence(
-                                                 confidences) if confidences else None
-                                         ))
-    stats[detected_activity].total_fames_appearances += 1
-    stats[detected_activity].timestamps.append(format_frame_timestamp(timestamp))
-    stats[detected_activity].confidence_avg = (
-        calculate_average_confidence(confidences)) if confidences else None
+def aggregate_statistics(events: list[tuple[Hashable, float]],
+                         render_name: Callable[[Hashable], str] = str,
+                         confidences: dict[Hashable, list[float]] | None = None) -> list[DetectionStatistics]:
+    grouped: dict[Hashable, list[float]] = {}
+    for detection_key, timestamp in events:
+        grouped.setdefault(detection_key, []).append(timestamp)
+
+    confidences = confidences or {}
+    format_timestamp = cache(format_frame_timestamp)
+    return [
+        DetectionStatistics(
+            detection_name=render_name(detection_key),
+            total_fames_appearances=len(timestamps),
+            timestamps=[format_timestamp(timestamp) for timestamp in timestamps],
+            confidence_avg=calculate_average_confidence(confidences[detection_key])
+            if confidences.get(detection_key) else None,
+        )
+        for detection_key, timestamps in grouped.items()
+    ]
 
 
 def reset_crew_memory(crew: Crew, memory: str = "all"):
@@ -77,33 +92,24 @@ def clean_llm_response(context: LLMCallHookContext):
         json.loads(response_stripped)
         return
     except (json.JSONDecodeError, ValueError):
-        print(f"cleaning the LLM response: {context.response[:100]} ...")
-        reasoning_markers = [
-            "Reasoning Plan:",
-            "Strategic Plan:",
-            "Analysis Plan:",
-            "Plan:",
-            "Final Answer:",
-        ]
-        for marker in reasoning_markers:
+        logger.debug("cleaning the LLM response: %.100s ...", context.response)
+        for marker in _REASONING_MARKERS:
             if marker in context.response:
-                parts = context.response.split(marker, 1)
-                if len(parts) > 1:
-                    context.response = parts[1].strip()
-                    context.response = context.response.replace('```markdown', '').strip()
-                    context.response = context.response.replace('```', '').strip()
-                    print(f"clear response: {context.response[:50]} ...")
+                context.response = context.response.split(marker, 1)[1].strip()
+                context.response = context.response.replace('```markdown', '').strip()
+                context.response = context.response.replace('```', '').strip()
+                logger.debug("clear response: %.50s ...", context.response)
 
 
 def clean_detection_tools_input(context: ToolCallHookContext):
-    print(f"CALLING PRE HOOK before tool {context.tool_name}")
+    logger.debug("CALLING PRE HOOK before tool %s", context.tool_name)
     inputs = context.tool_input
-    print(f"Input {inputs}")
+    logger.debug("Input %s", inputs)
     if 'properties' in inputs:
-        print("cleansing the input")
-        inputs['video_path'] = inputs['properties']['video_path']
-        inputs['frame_rate'] = inputs['properties']['frame_rate']
-        if 'media_pipe_model' in inputs['properties']:
-            inputs['media_pipe_model'] = inputs['properties']['media_pipe_model']
-        del inputs['properties']
-        print(f"input fixed : {inputs}")
+        logger.debug("cleansing the input")
+        properties = inputs.pop('properties')
+        inputs['video_path'] = properties['video_path']
+        inputs['frame_rate'] = properties['frame_rate']
+        if 'media_pipe_model' in properties:
+            inputs['media_pipe_model'] = properties['media_pipe_model']
+        logger.debug("input fixed : %s", inputs)
@@ -0,0 +1,145 @@
+import queue
+import threading
+
+import cv2
+
+from config.settings import VIDEO_HW_ACCELERATION
+
+# decoded frames waiting for the consumer; small, since it only needs to hide decode latency
+DECODED_FRAME_QUEUE_SIZE = 2
+DECODER_POLL_INTERVAL = 0.1
+
+
+def open_video_capture(video_path: str) -> cv2.VideoCapture:
+    """
+    Opens the video, asking OpenCV for hardware accelerated decoding when VIDEO_HW_ACCELERATION is set.
+    OpenCV falls back to software decoding when no accelerator is available, and frames are BGR either way.
+    """
+    if VIDEO_HW_ACCELERATION:
+        return cv2.VideoCapture(video_path, cv2.CAP_ANY,
+                                [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY])
+    return cv2.VideoCapture(video_path)
+
+
+def get_scaled_frame_size(height: int, width: int, max_size: int) -> tuple[int, int] | None:
+    """
+    (width, height) to downscale a frame to so that its longest side is max_size, keeping its aspect ratio,
+    or None when the frame is already small enough.
+    """
+    scale = max_size / max(height, width)
+    if scale >= 1:
+        return None
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+class VideoFrameIterator:
+    """
+    Iterates over (timestamp, frame) for every sample_rate-th frame of an opened cv2.VideoCapture.
+
+    Frames are decoded on a background thread while the consumer processes the previous one; OpenCV releases
+    the GIL while decoding, so both overlap. Skipped frames are only grabbed, never decoded into a pixel buffer.
+    Sampled frames can be downscaled to max_size and converted to RGB on the decoder thread as well.
+
+    Converted frames are written into a ring of preallocated buffers, sized so that a buffer is never
+    overwritten while it is still queued or held by the consumer: a yielded frame is only valid until the
+    next one is requested. The capture itself is not released; it stays owned by the caller.
+
+        with VideoFrameIterator(cap, sample_rate=5, rgb=True) as frames:
+            for timestamp, frame in frames:
+                ...
+    """
+
+    def __init__(self, cap: cv2.VideoCapture, sample_rate: int = 1, max_size: int | None = None,
+                 rgb: bool = False, queue_size: int = DECODED_FRAME_QUEUE_SIZE):
+        self.cap = cap
+        self.sample_rate = sample_rate
+        self.max_size = max_size
+        self.rgb = rgb
+        # timestamps are derived from the frame index instead of querying CAP_PROP_POS_MSEC for every frame
+        self.ms_per_frame = 1000.0 / (cap.get(cv2.CAP_PROP_FPS) or 30.0)
+
+        self._decoded_frames = queue.Queue(maxsize=queue_size)
+        self._stop_decoding = threading.Event()
+        self._decoder = threading.Thread(target=self._decode_sampled_frames, daemon=True)
+
+    def __enter__(self):
+        self._decoder.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __iter__(self):
+        while (decoded := self._decoded_frames.get()) is not None:
+            if isinstance(decoded, Exception):
+                raise decoded
+            yield decoded
+
+    def close(self):
+        self._stop_decoding.set()
+        if self._decoder.is_alive():
+            self._decoder.join()
+
+    def _decode_sampled_frames(self):
+        # decoder thread body: the stream ends with None, or with the raised exception so the consumer can report it
+        try:
+            self._decode()
+        except Exception as e:
+            self._put(e)
+            return
+        self._put(None)
+
+    def _decode(self):
+        cap = self.cap
+        frame_buffers = [None] * (self._decoded_frames.maxsize + 2)
+        resized_frame = None
+        source_shape = scaled_size = None
+        frame_number = 0
+        sampled_counter = 0
+
+        while cap.isOpened():
+            if frame_number % self.sample_rate != 0:
+                if not cap.grab():
+                    break
+                frame_number += 1
+                continue
+
+            ret, frame = cap.read()
+
+            if not ret:
+                break
+
+            if self.max_size and frame.shape[:2] != source_shape:
+                source_shape = frame.shape[:2]
+                scaled_size = get_scaled_frame_size(*source_shape, self.max_size)
+
+            if scaled_size or self.rgb:
+                buffer_index = sampled_counter % len(frame_buffers)
+                if scaled_size and self.rgb:
+                    frame = resized_frame = cv2.resize(frame, scaled_size, dst=resized_frame,
+                                                       interpolation=cv2.INTER_AREA)
+                    frame = frame_buffers[buffer_index] = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB,
+                                                                       dst=frame_buffers[buffer_index])
+                elif scaled_size:
+                    frame = frame_buffers[buffer_index] = cv2.resize(frame, scaled_size,
+                                                                     dst=frame_buffers[buffer_index],
+                                                                     interpolation=cv2.INTER_AREA)
+                else:
+                    frame = frame_buffers[buffer_index] = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB,
+                                                                       dst=frame_buffers[buffer_index])
+
+            if not self._put((frame_number * self.ms_per_frame, frame)):
+                return
+
+            sampled_counter += 1
+            frame_number += 1
+
+    def _put(self, item) -> bool:
+        # waits for room in the queue, giving up once the consumer has stopped reading
+        while not self._stop_decoding.is_set():
+            try:
+                self._decoded_frames.put(item, timeout=DECODER_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False